@@ -11,12 +11,16 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 import os
+import sys
 from datetime import timedelta
 from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+TESTING = sys.argv[1:2] == ["test"] or "PYTEST_VERSION" in os.environ
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
@@ -94,6 +98,11 @@ if os.environ.get("IN_DOCKER", False):
             "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
             "HOST": os.environ.get("POSTGRES_HOST"),
             "PORT": os.environ.get("POSTGRES_PORT"),
+            # Keep connections open between requests, pgbouncer pools them.
+            "CONN_MAX_AGE": 600,
+            "CONN_HEALTH_CHECKS": True,
+            # Server-side cursors don't survive pgbouncer transaction mode.
+            "DISABLE_SERVER_SIDE_CURSORS": True,
         }
     }
 else:
@@ -124,6 +133,11 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Tests don't need a slow password hash
+if TESTING:
+    PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -145,6 +159,21 @@ MEDIA_URL = "/media/"
 
 MEDIA_ROOT = "/vol/web/media"
 
+# Uploaded media goes to S3 (optionally behind a CDN) when a bucket is set,
+# so image requests never reach the app server.
+AWS_STORAGE_BUCKET_NAME = os.environ.get("AWS_STORAGE_BUCKET_NAME")
+
+if AWS_STORAGE_BUCKET_NAME:
+    AWS_S3_REGION_NAME = os.environ.get("AWS_S3_REGION_NAME")
+    AWS_S3_CUSTOM_DOMAIN = os.environ.get("AWS_S3_CUSTOM_DOMAIN")
+    AWS_QUERYSTRING_AUTH = False
+    STORAGES = {
+        "default": {"BACKEND": "storages.backends.s3boto3.S3Boto3Storage"},
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -184,10 +213,19 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": False,
 }
 
+REDIS_URL = os.environ.get("REDIS_URL", "redis://redis:6379/1")
+
+# Tests flush Redis between runs, so they get databases of their own,
+# counted down from the last of Redis' 16 default databases (15..2), one
+# per pytest-xdist worker.
+if TESTING:
+    worker_id = int(os.environ.get("PYTEST_XDIST_WORKER", "gw0").removeprefix("gw"))
+    REDIS_URL = urlunsplit(urlsplit(REDIS_URL)._replace(path=f"/{15 - worker_id % 14}"))
+
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
-        "LOCATION": "redis://redis:6379/1",
+        "LOCATION": REDIS_URL,
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
         },
@@ -0,0 +1,53 @@
+import hashlib
+
+from django.core.cache import cache
+from django.views.decorators.http import condition
+from rest_framework.response import Response
+
+from planetarium.signals import CACHE_PATTERNS, get_versions, register_cache_key
+
+
+def _state_hash(request, models):
+    """Hash of the models' change counters, computed once per request"""
+    if not hasattr(request, "_state_hash"):
+        state = repr(get_versions(models))
+        request._state_hash = hashlib.md5(state.encode()).hexdigest()
+    return request._state_hash
+
+
+def conditional(*models):
+    """Answers GET requests with 304 while none of the models has changed"""
+
+    def etag(request, *args, **kwargs):
+        return _state_hash(request, models)
+
+    return condition(etag_func=etag)
+
+
+# Caches the serialized list payload until one of cache_models changes.
+# Kept out of a docstring so it doesn't end up in the API schema.
+class CachedListMixin:
+    cache_prefix = None
+    cache_models = ()
+    cache_timeout = 60 * 5
+
+    def list(self, request, *args, **kwargs):
+        # The payload is the same for every user, but image URLs are
+        # absolute, so the host is part of the key.
+        cache_key = (
+            f"{self.cache_prefix}:"
+            f"{_state_hash(request, self.cache_models)}:"
+            f"{request.build_absolute_uri()}"
+        )
+        data = cache.get(cache_key)
+
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, data, self.cache_timeout)
+            for model in self.cache_models:
+                if model in CACHE_PATTERNS:
+                    register_cache_key(
+                        model, cache.make_key(cache_key), self.cache_timeout
+                    )
+
+        return Response(data)
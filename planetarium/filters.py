@@ -0,0 +1,33 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery
+from django.db import connections
+from rest_framework.filters import SearchFilter
+
+
+class FullTextSearchFilter(SearchFilter):
+    """Searches the indexed search_vector on Postgres, ILIKE elsewhere"""
+
+    search_vector_field = "search_vector"
+    search_config = "english"
+
+    def filter_queryset(self, request, queryset, view):
+        if connections[queryset.db].vendor != "postgresql":
+            return super().filter_queryset(request, queryset, view)
+
+        # Only word characters reach the raw tsquery, and the last term is
+        # matched as a prefix so partial input like "astro" still finds
+        # "astronomy", as the ILIKE search did.
+        terms = re.findall(r"\w+", request.query_params.get(self.search_param, ""))
+        if not terms:
+            return queryset
+
+        return queryset.filter(
+            **{
+                self.search_vector_field: SearchQuery(
+                    " & ".join(terms) + ":*",
+                    config=self.search_config,
+                    search_type="raw",
+                )
+            }
+        )
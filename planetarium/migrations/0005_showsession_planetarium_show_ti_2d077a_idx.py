@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-15 03:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0003_astronomyshow_image"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="showsession",
+            index=models.Index(
+                fields=["show_time"], name="planetarium_show_ti_2d077a_idx"
+            ),
+        ),
+    ]
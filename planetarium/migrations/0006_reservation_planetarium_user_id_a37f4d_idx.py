@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-15 03:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0005_showsession_planetarium_show_ti_2d077a_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="planetarium_user_id_a37f4d_idx",
+            ),
+        ),
+    ]
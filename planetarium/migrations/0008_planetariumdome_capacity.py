@@ -0,0 +1,31 @@
+# Generated by Django 5.1.4 on 2026-10-15 04:03
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0007_showsession_tickets_sold"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="planetariumdome",
+            name="capacity",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    models.F("rows"), "*", models.F("seats_in_row")
+                ),
+                output_field=models.IntegerField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="planetariumdome",
+            index=models.Index(
+                fields=["capacity"], name="planetarium_capacit_c5b777_idx"
+            ),
+        ),
+    ]
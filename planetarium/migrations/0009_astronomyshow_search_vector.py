@@ -0,0 +1,58 @@
+# Generated by Django 5.1.4 on 2026-10-15 04:05
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_CONFIG = "pg_catalog.english"
+
+
+def create_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        "CREATE INDEX planetarium_astronomyshow_search_vector_idx "
+        "ON planetarium_astronomyshow USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        "CREATE TRIGGER planetarium_astronomyshow_search_vector_update "
+        "BEFORE INSERT OR UPDATE OF title, description "
+        "ON planetarium_astronomyshow FOR EACH ROW "
+        "EXECUTE FUNCTION tsvector_update_trigger("
+        f"search_vector, '{SEARCH_CONFIG}', title, description)"
+    )
+    schema_editor.execute(
+        "UPDATE planetarium_astronomyshow SET search_vector = "
+        f"to_tsvector('{SEARCH_CONFIG}', title || ' ' || description)"
+    )
+
+
+def drop_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        "DROP TRIGGER IF EXISTS planetarium_astronomyshow_search_vector_update "
+        "ON planetarium_astronomyshow"
+    )
+    schema_editor.execute(
+        "DROP INDEX IF EXISTS planetarium_astronomyshow_search_vector_idx"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0008_planetariumdome_capacity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="astronomyshow",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(create_search_trigger, drop_search_trigger),
+    ]
@@ -1,6 +1,8 @@
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 
 from planetarium.utils import image_file_path
 
@@ -17,6 +19,8 @@ class AstronomyShow(models.Model):
     description = models.TextField()
     show_theme = models.ManyToManyField(ShowTheme)
     image = models.ImageField(null=True, upload_to=image_file_path)
+    # Kept up to date by a database trigger on Postgres, see migration 0009.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ["title"]
@@ -29,10 +33,14 @@ class PlanetariumDome(models.Model):
     name = models.CharField(max_length=63)
     rows = models.IntegerField()
     seats_in_row = models.IntegerField()
+    capacity = models.GeneratedField(
+        expression=F("rows") * F("seats_in_row"),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
 
-    @property
-    def capacity(self) -> int:
-        return self.rows * self.seats_in_row
+    class Meta:
+        indexes = [models.Index(fields=["capacity"])]
 
     def __str__(self):
         return self.name
@@ -46,6 +54,38 @@ class ShowSession(models.Model):
         PlanetariumDome, on_delete=models.CASCADE, related_name="show_sessions"
     )
     show_time = models.DateTimeField()
+    tickets_sold = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [models.Index(fields=["show_time"])]
+
+    def save(
+        self,
+        force_insert=False,
+        force_update=False,
+        using=None,
+        update_fields=None,
+    ):
+        # tickets_sold only changes through F() updates, a copy loaded
+        # before a ticket was sold or released must not write it back.
+        if not self._state.adding:
+            if update_fields is None:
+                update_fields = [
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if not field.primary_key
+                ]
+            update_fields = [
+                field_name
+                for field_name in update_fields
+                if field_name != "tickets_sold"
+            ]
+        return super(ShowSession, self).save(
+            force_insert=force_insert,
+            force_update=force_update,
+            using=using,
+            update_fields=update_fields,
+        )
 
     def __str__(self):
         return f"{self.astronomy_show.title} - {str(self.show_time)}"
@@ -59,6 +99,7 @@ class Reservation(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["user", "-created_at", "-id"])]
 
     def __str__(self):
         return str(self.created_at)
@@ -111,9 +152,28 @@ class Ticket(models.Model):
         update_fields=None,
     ):
         self.full_clean()
-        return super(Ticket, self).save(
-            force_insert, force_update, using, update_fields
-        )
+        with transaction.atomic(using=using):
+            previous_show_session_id = None
+            if not self._state.adding:
+                previous_show_session_id = (
+                    Ticket.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list("show_session_id", flat=True)
+                    .first()
+                )
+
+            super(Ticket, self).save(force_insert, force_update, using, update_fields)
+
+            # Counts the ticket for a new session, and releases it from the
+            # old one when an existing ticket is moved.
+            if previous_show_session_id != self.show_session_id:
+                if previous_show_session_id is not None:
+                    ShowSession.objects.filter(pk=previous_show_session_id).update(
+                        tickets_sold=F("tickets_sold") - 1
+                    )
+                ShowSession.objects.filter(pk=self.show_session_id).update(
+                    tickets_sold=F("tickets_sold") + 1
+                )
 
     def __str__(self):
         return f"{str(self.show_session)} (row: {self.row}, seat: {self.seat})"
@@ -1,6 +1,7 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination
 
 
-class ReservationPagination(PageNumberPagination):
-    page_size = 10
+class ReservationPagination(CursorPagination):
+    page_size = 20
     max_page_size = 100
+    ordering = ("-created_at", "-id")
@@ -0,0 +1,14 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        # Types orjson can't encode natively (lazy strings, Decimals, ...)
+        # go through DRF's encoder.
+        return orjson.dumps(data, default=self.encoder_class().default)
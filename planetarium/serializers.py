@@ -1,4 +1,7 @@
+from collections import Counter
+
 from django.db import transaction
+from django.db.models import F, Q
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
@@ -19,10 +22,18 @@ class ShowThemeSerializer(serializers.ModelSerializer):
 
 
 class PlanetariumDomeSerializer(serializers.ModelSerializer):
+    capacity = serializers.IntegerField(read_only=True)
+
     class Meta:
         model = PlanetariumDome
         fields = ("id", "name", "rows", "seats_in_row", "capacity")
 
+    def update(self, instance, validated_data):
+        instance = super().update(instance, validated_data)
+        # capacity is computed by the database, so reload it after a change
+        instance.refresh_from_db(fields=["capacity"])
+        return instance
+
 
 class AstronomyShowSerializer(serializers.ModelSerializer):
     class Meta:
@@ -45,6 +56,29 @@ class AstronomyShowListSerializer(AstronomyShowSerializer):
         fields = ("id", "title", "show_theme", "image")
 
 
+class ReadOnlyListSerializer(serializers.BaseSerializer):
+    """Builds list rows as plain dicts, skipping per-field DRF machinery"""
+
+    def image_url(self, image):
+        if not image:
+            return None
+
+        request = self.context.get("request")
+        if request is not None:
+            return request.build_absolute_uri(image.url)
+        return image.url
+
+
+class AstronomyShowListReadSerializer(ReadOnlyListSerializer):
+    def to_representation(self, instance):
+        return {
+            "id": instance.id,
+            "title": instance.title,
+            "show_theme": [show_theme.name for show_theme in instance.show_theme.all()],
+            "image": self.image_url(instance.image),
+        }
+
+
 class AstronomyShowDetailSerializer(AstronomyShowSerializer):
     show_theme = ShowThemeSerializer(many=True, read_only=True)
 
@@ -99,7 +133,26 @@ class ShowSessionListSerializer(ShowSessionSerializer):
         )
 
 
+class ShowSessionListReadSerializer(ReadOnlyListSerializer):
+    show_time_field = serializers.DateTimeField()
+
+    def to_representation(self, instance):
+        return {
+            "id": instance.id,
+            "show_time": self.show_time_field.to_representation(instance.show_time),
+            "astronomy_show_title": instance.astronomy_show.title,
+            "astronomy_show_image": self.image_url(instance.astronomy_show.image),
+            "planetarium_dome_name": instance.planetarium_dome.name,
+            "planetarium_dome_capacity": instance.planetarium_dome.capacity,
+            "tickets_available": instance.tickets_available,
+        }
+
+
 class TicketSerializer(serializers.ModelSerializer):
+    show_session = serializers.PrimaryKeyRelatedField(
+        queryset=ShowSession.objects.select_related("planetarium_dome")
+    )
+
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs=attrs)
         Ticket.validate_ticket(
@@ -141,13 +194,63 @@ class ShowSessionDetailSerializer(ShowSessionSerializer):
         )
 
 
+class ReservationTicketSerializer(serializers.ModelSerializer):
+    # Show sessions, seat ranges and taken seats are checked for all tickets
+    # at once in ReservationSerializer.validate_tickets.
+    show_session = serializers.IntegerField(source="show_session_id")
+
+    class Meta:
+        model = Ticket
+        fields = ("id", "row", "seat", "show_session")
+        validators = []
+
+
 class ReservationSerializer(serializers.ModelSerializer):
-    tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
+    tickets = ReservationTicketSerializer(many=True, read_only=False, allow_empty=False)
 
     class Meta:
         model = Reservation
         fields = ("id", "tickets", "created_at")
 
+    def validate_tickets(self, tickets):
+        show_sessions = ShowSession.objects.select_related("planetarium_dome").in_bulk(
+            {ticket["show_session_id"] for ticket in tickets}
+        )
+
+        seats = set()
+        for ticket in tickets:
+            show_session = show_sessions.get(ticket["show_session_id"])
+            if show_session is None:
+                raise ValidationError(
+                    f"Show session {ticket['show_session_id']} does not exist"
+                )
+            Ticket.validate_ticket(
+                ticket["row"],
+                ticket["seat"],
+                show_session.planetarium_dome,
+                ValidationError,
+            )
+
+            seat = (show_session.id, ticket["row"], ticket["seat"])
+            if seat in seats:
+                raise ValidationError(
+                    f"Seat (row: {ticket['row']}, seat: {ticket['seat']}) "
+                    f"is reserved more than once"
+                )
+            seats.add(seat)
+
+        taken_seats = Q()
+        for show_session_id, row, seat in seats:
+            taken_seats |= Q(show_session_id=show_session_id, row=row, seat=seat)
+        taken_seat = Ticket.objects.filter(taken_seats).values("row", "seat").first()
+        if taken_seat is not None:
+            raise ValidationError(
+                f"Seat (row: {taken_seat['row']}, seat: {taken_seat['seat']}) "
+                f"is already taken"
+            )
+
+        return tickets
+
     def create(self, validated_data):
         with transaction.atomic():
             tickets_data = validated_data.pop("tickets")
@@ -158,7 +261,13 @@ class ReservationSerializer(serializers.ModelSerializer):
                 for ticket_data in tickets_data
             ]
 
-            Ticket.objects.bulk_create(tickets)
+            Ticket.objects.bulk_create(tickets, batch_size=500)
+
+            sold = Counter(ticket.show_session_id for ticket in tickets)
+            for show_session_id, count in sold.items():
+                ShowSession.objects.filter(pk=show_session_id).update(
+                    tickets_sold=F("tickets_sold") + count
+                )
 
             return reservation
 
@@ -1,6 +1,12 @@
-from django.core.cache import cache
-from django.db.models.signals import post_save, post_delete
-from django.dispatch import receiver
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import redis
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete, m2m_changed
 
 from planetarium.models import (
     AstronomyShow,
@@ -8,6 +14,7 @@ from planetarium.models import (
     ShowTheme,
     PlanetariumDome,
     ShowSession,
+    Ticket,
 )
 
 
@@ -19,9 +26,164 @@ CACHE_PATTERNS = {
     Reservation: "*reservation_view*",
 }
 
+SCAN_COUNT = 10000
+UNLINK_CHUNK_SIZE = 500
+
+_pool = redis.ConnectionPool.from_url(settings.REDIS_URL, max_connections=50)
+_client = redis.Redis(connection_pool=_pool)
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-invalidation")
+
+
+def _version_key(model):
+    return f"version:{model._meta.label_lower}"
+
+
+def get_versions(models):
+    """Current change counters of the models, one Redis round trip"""
+    keys = [_version_key(model) for model in models]
+    versions = _client.mget(keys)
+    if None in versions:
+        # Start missing counters at the current time, so a counter lost to
+        # eviction or a flush never comes back with an old value.
+        pipe = _client.pipeline()
+        for key, version in zip(keys, versions):
+            if version is None:
+                pipe.set(key, time.time_ns(), nx=True)
+        pipe.execute()
+        versions = _client.mget(keys)
+    return [int(version) for version in versions]
+
+
+def _bump_versions(version_keys):
+    # A Redis outage must not fail the write that triggered the bump.
+    try:
+        pipe = _client.pipeline(transaction=False)
+        for version_key in version_keys:
+            pipe.incr(version_key)
+        pipe.execute()
+    except redis.RedisError:
+        logger.exception("Cache version bump failed")
+
+
+def _index_key(model):
+    return f"idx:{CACHE_PATTERNS[model].strip('*')}"
+
+
+def register_cache_key(model, key, timeout=None):
+    """Adds a cache key to the set of keys invalidated on model changes"""
+    index_key = _index_key(model)
+    pipe = _client.pipeline()
+    pipe.sadd(index_key, key)
+    if timeout:
+        pipe.expire(index_key, timeout)
+    pipe.execute()
+
+
+def _invalidate(index_keys):
+    pipe = _client.pipeline(transaction=False)
+    chunk = []
+    for index_key in index_keys:
+        for key in _client.sscan_iter(index_key, count=SCAN_COUNT):
+            chunk.append(key)
+            if len(chunk) == UNLINK_CHUNK_SIZE:
+                pipe.unlink(*chunk)
+                chunk = []
+    pipe.unlink(*chunk, *index_keys)
+    pipe.execute()
+
+
+def _log_failure(future):
+    exception = future.exception()
+    if exception is not None:
+        logger.error(
+            "Cache invalidation failed",
+            exc_info=(type(exception), exception, exception.__traceback__),
+        )
+
+
+class _PendingInvalidation:
+    """Changes collected in one transaction, invalidated once it commits"""
+
+    def __init__(self):
+        self.index_keys = set()
+        self.version_keys = set()
+        self.flushed = False
+
+    def __call__(self):
+        self.flushed = True
+        # Bumped again after commit, so nothing cached from the old rows
+        # while the transaction was open keeps a current version.
+        _bump_versions(self.version_keys)
+        if self.index_keys:
+            _executor.submit(_invalidate, self.index_keys).add_done_callback(
+                _log_failure
+            )
+
+
+def _pending_invalidation():
+    # Lives in the connection's on_commit queue, one per savepoint level, so
+    # a rollback, partial or full, drops the collected keys together with
+    # the callback.
+    connection = transaction.get_connection()
+    savepoint_ids = set(connection.savepoint_ids)
+    for sids, callback, _ in connection.run_on_commit:
+        if (
+            isinstance(callback, _PendingInvalidation)
+            and not callback.flushed
+            and sids == savepoint_ids
+        ):
+            return callback
+    return None
+
+
+def _touch(model):
+    version_key = _version_key(model)
+    pending = _pending_invalidation()
+    is_new = pending is None
+    if is_new:
+        pending = _PendingInvalidation()
+
+    if (
+        version_key not in pending.version_keys
+        and transaction.get_connection().in_atomic_block
+    ):
+        # Bumped right away, once per transaction, so the writing request
+        # itself reads fresh data. Outside a transaction the flush below
+        # runs immediately and bumps it anyway.
+        _bump_versions([version_key])
+
+    pending.version_keys.add(version_key)
+    if model in CACHE_PATTERNS:
+        pending.index_keys.add(_index_key(model))
+
+    if is_new:
+        transaction.on_commit(pending)
+
 
-@receiver([post_save, post_delete])
 def invalidate_cache(sender, instance, **kwargs):
-    pattern = CACHE_PATTERNS.get(sender)
-    if pattern:
-        cache.delete_pattern(pattern)
+    _touch(sender)
+
+
+def invalidate_show_themes(sender, instance, action, **kwargs):
+    if action.startswith("post_"):
+        _touch(AstronomyShow)
+
+
+for model in (*CACHE_PATTERNS, Ticket):
+    post_save.connect(invalidate_cache, sender=model)
+    post_delete.connect(invalidate_cache, sender=model)
+
+m2m_changed.connect(invalidate_show_themes, sender=AstronomyShow.show_theme.through)
+
+
+def release_ticket(sender, instance, **kwargs):
+    # Runs for cascades and queryset deletes too, unlike Ticket.delete().
+    ShowSession.objects.filter(pk=instance.show_session_id).update(
+        tickets_sold=F("tickets_sold") - 1
+    )
+
+
+post_delete.connect(release_ticket, sender=Ticket)
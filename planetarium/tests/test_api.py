@@ -1,32 +1,71 @@
+import functools
+import io
 import os
+import shutil
 import tempfile
+from unittest import skipUnless
 
 from PIL import Image
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
 from django.urls import reverse
 from django_redis import get_redis_connection
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from planetarium.models import (
     ShowTheme,
     AstronomyShow,
     PlanetariumDome,
     ShowSession,
+    Reservation,
 )
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from rest_framework.test import APITestCase
 from rest_framework import status
 
 from planetarium.serializers import (
     AstronomyShowListSerializer,
     AstronomyShowDetailSerializer,
+    ShowThemeSerializer,
+    PlanetariumDomeSerializer,
 )
 
 
 ASTRONOMY_SHOW_URL = reverse("planetarium:astronomyshow-list")
+SHOW_SESSION_URL = reverse("planetarium:showsession-list")
+RESERVATION_URL = reverse("planetarium:reservation-list")
+SHOW_THEME_URL = reverse("planetarium:showtheme-list")
+PLANETARIUM_DOME_URL = reverse("planetarium:planetariumdome-list")
 
 
 User = get_user_model()
 
+HASHED_PASSWORD = make_password("testpass")
+
+
+def astronomy_show_list_data_by_id():
+    serializer = AstronomyShowListSerializer(
+        AstronomyShow.objects.prefetch_related("show_theme"), many=True
+    )
+    return {astronomy_show["id"]: astronomy_show for astronomy_show in serializer.data}
+
+
+@functools.lru_cache(maxsize=None)
+def detail_url(astronomy_show_id):
+    return reverse("planetarium:astronomyshow-detail", args=[astronomy_show_id])
+
+
+@functools.lru_cache(maxsize=None)
+def image_upload_url(astronomy_show_id):
+    return reverse("planetarium:astronomyshow-upload-image", args=[astronomy_show_id])
+
+
+@functools.lru_cache(maxsize=None)
+def show_session_detail_url(show_session_id):
+    return reverse("planetarium:showsession-detail", args=[show_session_id])
+
 
 def sample_astronomy_show(**params):
     defaults = {
@@ -38,6 +77,12 @@ def sample_astronomy_show(**params):
     return AstronomyShow.objects.create(**defaults)
 
 
+def sample_astronomy_shows(*titles):
+    return AstronomyShow.objects.bulk_create(
+        AstronomyShow(title=title, description="Sample description") for title in titles
+    )
+
+
 def sample_show_session(**params):
     planetarium_dome = PlanetariumDome.objects.create(
         name="Small", rows=20, seats_in_row=20
@@ -54,81 +99,159 @@ def sample_show_session(**params):
 
 
 class AuthenticatedAstronomyShowApiTests(APITestCase):
-    def setUp(self):
-        self.user = User.objects.create_user(email="test@user.com", password="testpass")
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email="test@user.com", password=HASHED_PASSWORD)
 
-        refresh = RefreshToken.for_user(self.user)
-        self.access_token = str(refresh.access_token)
-
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
 
     def tearDown(self):
-        get_redis_connection("default").flushall()
+        get_redis_connection("default").flushdb(asynchronous=True)
 
     def test_list_astronomy_shows(self):
         sample_astronomy_show()
         sample_astronomy_show()
 
+        with self.assertNumQueries(2):
+            res = self.client.get(ASTRONOMY_SHOW_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [astronomy_show["id"] for astronomy_show in res.data],
+            list(AstronomyShow.objects.order_by("id").values_list("id", flat=True)),
+        )
+
+    def test_list_astronomy_shows_not_modified(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            sample_astronomy_show()
+        etag = self.client.get(ASTRONOMY_SHOW_URL)["ETag"]
+
+        res = self.client.get(ASTRONOMY_SHOW_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        sample_astronomy_show()
+        res = self.client.get(ASTRONOMY_SHOW_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 2)
+
+    def test_list_astronomy_shows_modified_after_delete(self):
+        astronomy_show = sample_astronomy_show()
         res = self.client.get(ASTRONOMY_SHOW_URL)
+        self.assertNotIn("Last-Modified", res)
 
-        astronomy_shows = AstronomyShow.objects.order_by("id")
-        serializer = AstronomyShowListSerializer(astronomy_shows, many=True)
+        astronomy_show.delete()
+        res = self.client.get(ASTRONOMY_SHOW_URL, HTTP_IF_NONE_MATCH=res["ETag"])
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data, [])
+
+    def test_list_astronomy_shows_modified_after_show_theme_change(self):
+        astronomy_show = sample_astronomy_show()
+        show_theme = ShowTheme.objects.create(name="Show Theme")
+        etag = self.client.get(ASTRONOMY_SHOW_URL)["ETag"]
+
+        astronomy_show.show_theme.add(show_theme)
+        res = self.client.get(ASTRONOMY_SHOW_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]["show_theme"], ["Show Theme"])
+
+    def test_list_astronomy_shows_is_cached(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            sample_astronomy_show()
+        self.client.get(ASTRONOMY_SHOW_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ASTRONOMY_SHOW_URL)
+        self.assertEqual(len(res.data), 1)
+
+        sample_astronomy_show()
+        res = self.client.get(ASTRONOMY_SHOW_URL)
+        self.assertEqual(len(res.data), 2)
 
     def test_filter_astronomy_shows_by_show_themes(self):
         show_theme1 = ShowTheme.objects.create(name="Show Theme 1")
         show_theme2 = ShowTheme.objects.create(name="Show Theme 2")
 
-        astronomy_show1 = sample_astronomy_show(title="Astronomy Show 1")
-        astronomy_show2 = sample_astronomy_show(title="Astronomy Show 2")
+        astronomy_show1, astronomy_show2, astronomy_show3 = sample_astronomy_shows(
+            "Astronomy Show 1",
+            "Astronomy Show 2",
+            "Astronomy Show without show theme",
+        )
 
         astronomy_show1.show_theme.add(show_theme1)
         astronomy_show2.show_theme.add(show_theme2)
 
-        astronomy_show3 = sample_astronomy_show(
-            title="Astronomy Show without show theme"
+        res = self.client.get(
+            ASTRONOMY_SHOW_URL,
+            {"show_theme": f"{show_theme1.id},{show_theme2.id}"},
         )
 
+        data_by_id = astronomy_show_list_data_by_id()
+
+        self.assertIn(data_by_id[astronomy_show1.id], res.data)
+        self.assertIn(data_by_id[astronomy_show2.id], res.data)
+        self.assertNotIn(data_by_id[astronomy_show3.id], res.data)
+
+    def test_filter_astronomy_shows_by_show_themes_without_duplicates(self):
+        show_theme1 = ShowTheme.objects.create(name="Show Theme 1")
+        show_theme2 = ShowTheme.objects.create(name="Show Theme 2")
+
+        astronomy_show = sample_astronomy_show()
+        astronomy_show.show_theme.add(show_theme1, show_theme2)
+
         res = self.client.get(
             ASTRONOMY_SHOW_URL,
             {"show_theme": f"{show_theme1.id},{show_theme2.id}"},
         )
 
-        serializer1 = AstronomyShowListSerializer(astronomy_show1)
-        serializer2 = AstronomyShowListSerializer(astronomy_show2)
-        serializer3 = AstronomyShowListSerializer(astronomy_show3)
-
-        self.assertIn(serializer1.data, res.data)
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer3.data, res.data)
+        self.assertEqual(len(res.data), 1)
 
     def test_filter_astronomy_show_by_title(self):
-        astronomy_show1 = sample_astronomy_show(title="Astronomy Show")
-        astronomy_show2 = sample_astronomy_show(title="Another Astronomy Show")
-        astronomy_show3 = sample_astronomy_show(title="No match")
+        astronomy_show1, astronomy_show2, astronomy_show3 = sample_astronomy_shows(
+            "Astronomy Show", "Another Astronomy Show", "No match"
+        )
 
         res = self.client.get(ASTRONOMY_SHOW_URL, {"title": "astronomy show"})
 
-        serializer1 = AstronomyShowListSerializer(astronomy_show1)
-        serializer2 = AstronomyShowListSerializer(astronomy_show2)
-        serializer3 = AstronomyShowListSerializer(astronomy_show3)
+        data_by_id = astronomy_show_list_data_by_id()
+
+        self.assertIn(data_by_id[astronomy_show1.id], res.data)
+        self.assertIn(data_by_id[astronomy_show2.id], res.data)
+        self.assertNotIn(data_by_id[astronomy_show3.id], res.data)
+
+    def test_search_astronomy_shows(self):
+        astronomy_show1, astronomy_show2 = sample_astronomy_shows(
+            "Northern Lights", "Black Holes"
+        )
+
+        res = self.client.get(ASTRONOMY_SHOW_URL, {"search": "northern"})
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer3.data, res.data)
+        self.assertEqual(
+            [astronomy_show["id"] for astronomy_show in res.data],
+            [astronomy_show1.id],
+        )
+
+    @skipUnless(connection.vendor == "postgresql", "search_vector is Postgres only")
+    def test_search_astronomy_shows_by_prefix(self):
+        astronomy_show1, astronomy_show2 = sample_astronomy_shows(
+            "Northern Lights", "Black Holes"
+        )
+
+        res = self.client.get(ASTRONOMY_SHOW_URL, {"search": "lights north"})
+
+        self.assertEqual(
+            [astronomy_show["id"] for astronomy_show in res.data],
+            [astronomy_show1.id],
+        )
 
     def test_retrieve_astronomy_show_detail(self):
         astronomy_show = sample_astronomy_show()
         astronomy_show.show_theme.add(ShowTheme.objects.create(name="Show Theme"))
 
-        res = self.client.get(
-            reverse(
-                "planetarium:astronomyshow-detail",
-                args=[astronomy_show.id],
-            )
-        )
+        with self.assertNumQueries(2):
+            res = self.client.get(detail_url(astronomy_show.id))
 
         serializer = AstronomyShowDetailSerializer(astronomy_show)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -145,18 +268,20 @@ class AuthenticatedAstronomyShowApiTests(APITestCase):
 
 
 class AdminAstronomyShowApiTests(APITestCase):
-    def setUp(self):
-        self.user = User.objects.create_superuser(
-            email="admin@admin.com", password="testpass"
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            email="admin@admin.com",
+            password=HASHED_PASSWORD,
+            is_staff=True,
+            is_superuser=True,
         )
 
-        refresh = RefreshToken.for_user(self.user)
-        self.access_token = str(refresh.access_token)
-
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
 
     def tearDown(self):
-        get_redis_connection("default").flushall()
+        get_redis_connection("default").flushdb(asynchronous=True)
 
     def test_create_astronomy_show(self):
         show_theme1 = ShowTheme.objects.create(name="Show Theme 1")
@@ -182,48 +307,53 @@ class AdminAstronomyShowApiTests(APITestCase):
 
 
 class AstronomyShowImageUploadTests(APITestCase):
-    def setUp(self):
-        self.user = User.objects.create_superuser(
-            email="admin@admin.com", password="testpass"
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, media_root)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=media_root))
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (10, 10)).save(buffer, format="JPEG")
+        cls.jpeg = buffer.getvalue()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            email="admin@admin.com",
+            password=HASHED_PASSWORD,
+            is_staff=True,
+            is_superuser=True,
         )
 
-        refresh = RefreshToken.for_user(self.user)
-        self.access_token = str(refresh.access_token)
-
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        cls.astronomy_show = sample_astronomy_show()
+        cls.show_session = sample_show_session(astronomy_show=cls.astronomy_show)
 
-        self.astronomy_show = sample_astronomy_show()
-        self.show_session = sample_show_session(astronomy_show=self.astronomy_show)
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
 
     def tearDown(self):
-        get_redis_connection("default").flushall()
-        self.astronomy_show.image.delete()
+        get_redis_connection("default").flushdb(asynchronous=True)
 
-    def test_upload_image_to_astronomy_show(self):
-        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
-            img = Image.new("RGB", (10, 10))
-            img.save(ntf, format="JPEG")
-            ntf.seek(0)
-            res = self.client.post(
-                reverse(
-                    "planetarium:astronomyshow-upload-image",
-                    args=[self.astronomy_show.id],
-                ),
-                {"image": ntf},
-                format="multipart",
-            )
-        self.astronomy_show.refresh_from_db()
+    def image_upload(self):
+        return SimpleUploadedFile("image.jpg", self.jpeg, content_type="image/jpeg")
 
+    def test_upload_image_to_astronomy_show(self):
+        res = self.client.post(
+            image_upload_url(self.astronomy_show.id),
+            {"image": self.image_upload()},
+            format="multipart",
+        )
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertIn("image", res.data)
-        self.assertTrue(os.path.exists(self.astronomy_show.image.path))
+
+        image_name = res.data["image"].split(settings.MEDIA_URL, 1)[1]
+        self.assertTrue(os.path.exists(os.path.join(settings.MEDIA_ROOT, image_name)))
 
     def test_upload_image_bad_request(self):
         res = self.client.post(
-            reverse(
-                "planetarium:astronomyshow-upload-image",
-                args=[self.astronomy_show.id],
-            ),
+            image_upload_url(self.astronomy_show.id),
             {"image": "not image"},
             format="multipart",
         )
@@ -231,83 +361,266 @@ class AstronomyShowImageUploadTests(APITestCase):
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_post_image_to_astronomy_show_list_should_not_work(self):
-        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
-            show_theme = ShowTheme.objects.create(name="Show Theme")
-            img = Image.new("RGB", (10, 10))
-            img.save(ntf, format="JPEG")
-            ntf.seek(0)
-            res = self.client.post(
-                ASTRONOMY_SHOW_URL,
-                {
-                    "title": "Title",
-                    "description": "Description",
-                    "show_theme": [show_theme.id],
-                    "image": ntf,
-                },
-                format="multipart",
-            )
+        show_theme = ShowTheme.objects.create(name="Show Theme")
+        res = self.client.post(
+            ASTRONOMY_SHOW_URL,
+            {
+                "title": "Title",
+                "description": "Description",
+                "show_theme": [show_theme.id],
+                "image": self.image_upload(),
+            },
+            format="multipart",
+        )
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         astronomy_show = AstronomyShow.objects.get(title="Title")
         self.assertFalse(astronomy_show.image)
 
     def test_image_url_is_shown_on_astronomy_show_detail(self):
-        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
-            img = Image.new("RGB", (10, 10))
-            img.save(ntf, format="JPEG")
-            ntf.seek(0)
-            self.client.post(
-                reverse(
-                    "planetarium:astronomyshow-upload-image",
-                    args=[self.astronomy_show.id],
-                ),
-                {"image": ntf},
-                format="multipart",
-            )
-        res = self.client.get(
-            reverse(
-                "planetarium:astronomyshow-detail",
-                args=[self.astronomy_show.id],
-            )
+        self.client.post(
+            image_upload_url(self.astronomy_show.id),
+            {"image": self.image_upload()},
+            format="multipart",
         )
+        res = self.client.get(detail_url(self.astronomy_show.id))
 
         self.assertIn("image", res.data)
 
     def test_image_url_is_shown_on_astronomy_show_list(self):
-        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
-            img = Image.new("RGB", (10, 10))
-            img.save(ntf, format="JPEG")
-            ntf.seek(0)
-            self.client.post(
-                reverse(
-                    "planetarium:astronomyshow-upload-image",
-                    args=[self.astronomy_show.id],
-                ),
-                {"image": ntf},
-                format="multipart",
-            )
+        self.client.post(
+            image_upload_url(self.astronomy_show.id),
+            {"image": self.image_upload()},
+            format="multipart",
+        )
         res = self.client.get(ASTRONOMY_SHOW_URL)
 
         self.assertIn("image", res.data[0].keys())
 
     def test_image_url_is_shown_on_astronomy_show_session_detail(self):
-        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
-            img = Image.new("RGB", (10, 10))
-            img.save(ntf, format="JPEG")
-            ntf.seek(0)
-            self.client.post(
-                reverse(
-                    "planetarium:astronomyshow-upload-image",
-                    args=[self.astronomy_show.id],
-                ),
-                {"image": ntf},
-                format="multipart",
-            )
+        self.client.post(
+            image_upload_url(self.astronomy_show.id),
+            {"image": self.image_upload()},
+            format="multipart",
+        )
         res = self.client.get(
-            reverse(
-                "planetarium:showsession-detail",
-                args=[self.show_session.id],
-            ),
+            show_session_detail_url(self.show_session.id),
         )
 
         self.assertIn("image", res.data["astronomy_show"].keys())
+
+
+class ShowThemeApiTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email="test@user.com", password=HASHED_PASSWORD)
+        ShowTheme.objects.bulk_create(
+            [ShowTheme(name="Galaxies"), ShowTheme(name="Black holes")]
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        get_redis_connection("default").flushdb(asynchronous=True)
+
+    def test_list_show_themes(self):
+        res = self.client.get(SHOW_THEME_URL)
+
+        serializer = ShowThemeSerializer(ShowTheme.objects.all(), many=True)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, serializer.data)
+
+    def test_filter_show_themes_by_name(self):
+        res = self.client.get(SHOW_THEME_URL, {"search": "galax"})
+
+        self.assertEqual([theme["name"] for theme in res.data], ["Galaxies"])
+
+
+class PlanetariumDomeApiTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email="test@user.com", password=HASHED_PASSWORD)
+        PlanetariumDome.objects.bulk_create(
+            [
+                PlanetariumDome(name="Small", rows=10, seats_in_row=15),
+                PlanetariumDome(name="Large", rows=30, seats_in_row=40),
+            ]
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        get_redis_connection("default").flushdb(asynchronous=True)
+
+    def test_list_planetarium_domes(self):
+        res = self.client.get(PLANETARIUM_DOME_URL)
+
+        serializer = PlanetariumDomeSerializer(PlanetariumDome.objects.all(), many=True)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, serializer.data)
+
+    def test_update_planetarium_dome_returns_new_capacity(self):
+        admin = User.objects.create(
+            email="admin@admin.com",
+            password=HASHED_PASSWORD,
+            is_staff=True,
+            is_superuser=True,
+        )
+        self.client.force_authenticate(user=admin)
+        planetarium_dome = PlanetariumDome.objects.get(name="Small")
+
+        res = self.client.put(
+            reverse("planetarium:planetariumdome-detail", args=[planetarium_dome.id]),
+            {"name": "Small", "rows": 5, "seats_in_row": 3},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["capacity"], 15)
+
+
+class ShowSessionApiTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email="test@user.com", password=HASHED_PASSWORD)
+        cls.astronomy_show1, cls.astronomy_show2 = sample_astronomy_shows(
+            "Astronomy Show 1", "Astronomy Show 2"
+        )
+        cls.show_session1 = sample_show_session(
+            astronomy_show=cls.astronomy_show1, show_time="2024-12-25T23:30:00Z"
+        )
+        cls.show_session2 = sample_show_session(
+            astronomy_show=cls.astronomy_show2, show_time="2024-12-26T00:00:00Z"
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        get_redis_connection("default").flushdb(asynchronous=True)
+
+    def test_filter_show_sessions_by_astronomy_show(self):
+        res = self.client.get(
+            SHOW_SESSION_URL, {"astronomy_show": self.astronomy_show1.id}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [show_session["id"] for show_session in res.data],
+            [self.show_session1.id],
+        )
+
+    def test_filter_show_sessions_by_date(self):
+        res = self.client.get(SHOW_SESSION_URL, {"date": "2024-12-26"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [show_session["id"] for show_session in res.data],
+            [self.show_session2.id],
+        )
+
+    def test_filter_show_sessions_by_invalid_astronomy_show(self):
+        with self.assertLogs("planetarium.views", level="WARNING"):
+            res = self.client.get(SHOW_SESSION_URL, {"astronomy_show": "abc"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 2)
+
+    def test_filter_show_sessions_by_invalid_date(self):
+        with self.assertLogs("planetarium.views", level="WARNING"):
+            res = self.client.get(SHOW_SESSION_URL, {"date": "26.12.2024"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 2)
+
+
+class ReservationApiTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email="test@user.com", password=HASHED_PASSWORD)
+        cls.show_session = sample_show_session(astronomy_show=sample_astronomy_show())
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        get_redis_connection("default").flushdb(asynchronous=True)
+
+    def create_reservation(self, seat):
+        return self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"row": 1, "seat": seat, "show_session": self.show_session.id}
+                ]
+            },
+            format="json",
+        )
+
+    def test_list_reservations_is_cached(self):
+        self.create_reservation(seat=1)
+        self.client.get(RESERVATION_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(RESERVATION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 1)
+
+    def test_list_reservations_renders_json(self):
+        self.create_reservation(seat=1)
+
+        res = self.client.get(RESERVATION_URL)
+
+        self.assertEqual(res["Content-Type"], "application/json")
+        self.assertEqual(res.json()["results"][0]["tickets"][0]["seat"], 1)
+
+    def test_create_reservation_invalidates_cached_list(self):
+        self.create_reservation(seat=1)
+        self.client.get(RESERVATION_URL)
+
+        self.create_reservation(seat=2)
+        res = self.client.get(RESERVATION_URL)
+
+        self.assertEqual(len(res.data["results"]), 2)
+
+    def test_cached_list_is_not_shared_between_users(self):
+        self.create_reservation(seat=1)
+        self.client.get(RESERVATION_URL)
+
+        other_user = User.objects.create(
+            email="other@user.com", password=HASHED_PASSWORD
+        )
+        self.client.force_authenticate(user=other_user)
+        res = self.client.get(RESERVATION_URL)
+
+        self.assertEqual(res.data["results"], [])
+
+    def test_create_reservation_updates_tickets_sold(self):
+        self.create_reservation(seat=1)
+        self.create_reservation(seat=2)
+
+        self.show_session.refresh_from_db()
+        self.assertEqual(self.show_session.tickets_sold, 2)
+
+        res = self.client.get(SHOW_SESSION_URL)
+        self.assertEqual(res.data[0]["tickets_available"], 398)
+
+    def test_create_reservation_changes_show_session_list(self):
+        self.client.get(SHOW_SESSION_URL)
+
+        self.create_reservation(seat=1)
+        res = self.client.get(SHOW_SESSION_URL)
+
+        self.assertEqual(res.data[0]["tickets_available"], 399)
+
+    def test_delete_reservation_releases_tickets(self):
+        self.create_reservation(seat=1)
+
+        Reservation.objects.filter(user=self.user).delete()
+
+        self.show_session.refresh_from_db()
+        self.assertEqual(self.show_session.tickets_sold, 0)
@@ -10,31 +10,35 @@ from planetarium.models import (
     Reservation,
 )
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 
 
 User = get_user_model()
 
+HASHED_PASSWORD = make_password("testpass")
+
 
 class ModelsTestCase(TestCase):
-    def setUp(self):
-        self.user = User.objects.create_user(email="test@user.com", password="testpass")
-        self.show_theme = ShowTheme.objects.create(name="Educational")
-        self.astronomy_show = AstronomyShow.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email="test@user.com", password=HASHED_PASSWORD)
+        cls.show_theme = ShowTheme.objects.create(name="Educational")
+        cls.astronomy_show = AstronomyShow.objects.create(
             title="The Wonders of Space",
             description="An amazing journey through the cosmos.",
         )
-        self.astronomy_show.show_theme.add(self.show_theme)
+        cls.astronomy_show.show_theme.add(cls.show_theme)
 
-        self.planetarium_dome = PlanetariumDome.objects.create(
+        cls.planetarium_dome = PlanetariumDome.objects.create(
             name="Main Dome", rows=10, seats_in_row=10
         )
 
-        self.show_session = ShowSession.objects.create(
-            astronomy_show=self.astronomy_show,
-            planetarium_dome=self.planetarium_dome,
+        cls.show_session = ShowSession.objects.create(
+            astronomy_show=cls.astronomy_show,
+            planetarium_dome=cls.planetarium_dome,
             show_time="2024-12-30 14:00:00",
         )
-        self.reservation = Reservation.objects.create(user=self.user)
+        cls.reservation = Reservation.objects.create(user=cls.user)
 
     def test_show_theme_str(self):
         self.assertEqual(str(self.show_theme), "Educational")
@@ -64,3 +68,38 @@ class ModelsTestCase(TestCase):
                 reservation=self.reservation,
             )
             invalid_ticket.full_clean()
+
+    def test_moving_ticket_updates_tickets_sold(self):
+        other_show_session = ShowSession.objects.create(
+            astronomy_show=self.astronomy_show,
+            planetarium_dome=self.planetarium_dome,
+            show_time="2024-12-31 14:00:00",
+        )
+        ticket = Ticket.objects.create(
+            row=5, seat=5, show_session=self.show_session, reservation=self.reservation
+        )
+
+        ticket.show_session = other_show_session
+        ticket.save()
+
+        self.show_session.refresh_from_db()
+        other_show_session.refresh_from_db()
+        self.assertEqual(self.show_session.tickets_sold, 0)
+        self.assertEqual(other_show_session.tickets_sold, 1)
+
+        ticket.delete()
+
+        other_show_session.refresh_from_db()
+        self.assertEqual(other_show_session.tickets_sold, 0)
+
+    def test_saving_stale_show_session_keeps_tickets_sold(self):
+        stale_show_session = ShowSession.objects.get(pk=self.show_session.pk)
+        Ticket.objects.create(
+            row=5, seat=5, show_session=self.show_session, reservation=self.reservation
+        )
+
+        stale_show_session.show_time = "2024-12-30 15:00:00"
+        stale_show_session.save()
+
+        self.show_session.refresh_from_db()
+        self.assertEqual(self.show_session.tickets_sold, 1)
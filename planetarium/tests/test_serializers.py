@@ -1,8 +1,11 @@
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db.models import Value
 from django.test import TestCase
 from django.urls import reverse
+from django_redis import get_redis_connection
 from rest_framework.exceptions import ValidationError
-from rest_framework.test import APIRequestFactory
+from rest_framework.test import APIClient, APIRequestFactory
 from planetarium.models import (
     ShowSession,
     Reservation,
@@ -13,8 +16,12 @@ from planetarium.models import (
 )
 from planetarium.serializers import (
     ShowThemeSerializer,
+    PlanetariumDomeSerializer,
     AstronomyShowSerializer,
     AstronomyShowListSerializer,
+    AstronomyShowListReadSerializer,
+    ShowSessionListSerializer,
+    ShowSessionListReadSerializer,
     TicketSerializer,
     ReservationSerializer,
 )
@@ -22,35 +29,53 @@ from planetarium.serializers import (
 
 User = get_user_model()
 
+HASHED_PASSWORD = make_password("testpass")
+
 
 class SerializerTests(TestCase):
-    def setUp(self):
-        self.user = User.objects.create_user(email="test@user.com", password="testpass")
-        self.show_theme = ShowTheme.objects.create(name="Space Exploration")
-        self.dome = PlanetariumDome.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email="test@user.com", password=HASHED_PASSWORD)
+        cls.show_theme = ShowTheme.objects.create(name="Space Exploration")
+        cls.dome = PlanetariumDome.objects.create(
             name="Main Dome", rows=10, seats_in_row=15
         )
-        self.assertEqual(self.dome.capacity, 150)
-        self.astronomy_show = AstronomyShow.objects.create(
+        cls.astronomy_show = AstronomyShow.objects.create(
             title="Journey to the Stars", description="A journey through the universe."
         )
-        self.astronomy_show.show_theme.add(self.show_theme)
-        self.show_session = ShowSession.objects.create(
+        cls.astronomy_show.show_theme.add(cls.show_theme)
+        cls.show_session = ShowSession.objects.create(
             show_time="2024-12-31 20:00",
-            astronomy_show=self.astronomy_show,
-            planetarium_dome=self.dome,
+            astronomy_show=cls.astronomy_show,
+            planetarium_dome=cls.dome,
         )
-        self.reservation = Reservation.objects.create(user=self.user)
-        self.ticket = Ticket.objects.create(
-            row=5, seat=10, show_session=self.show_session, reservation=self.reservation
+        cls.reservation = Reservation.objects.create(user=cls.user)
+        cls.ticket = Ticket.objects.create(
+            row=5, seat=10, show_session=cls.show_session, reservation=cls.reservation
         )
 
+    def tearDown(self):
+        get_redis_connection("default").flushdb(asynchronous=True)
+
     def test_show_theme_serializer(self):
         serializer = ShowThemeSerializer(instance=self.show_theme)
         self.assertEqual(
             serializer.data, {"id": self.show_theme.id, "name": "Space Exploration"}
         )
 
+    def test_planetarium_dome_serializer(self):
+        serializer = PlanetariumDomeSerializer(instance=self.dome)
+        self.assertEqual(
+            serializer.data,
+            {
+                "id": self.dome.id,
+                "name": "Main Dome",
+                "rows": 10,
+                "seats_in_row": 15,
+                "capacity": 150,
+            },
+        )
+
     def test_astronomy_show_serializer(self):
         serializer = AstronomyShowSerializer(instance=self.astronomy_show)
         self.assertEqual(
@@ -75,6 +100,34 @@ class SerializerTests(TestCase):
             },
         )
 
+    def test_astronomy_show_list_serializer_queries(self):
+        for title in ("Black Holes", "Northern Lights"):
+            AstronomyShow.objects.create(
+                title=title, description="Description"
+            ).show_theme.add(self.show_theme)
+
+        with self.assertNumQueries(2):
+            data = AstronomyShowListSerializer(
+                AstronomyShow.objects.prefetch_related("show_theme"), many=True
+            ).data
+
+        self.assertEqual(len(data), 3)
+
+    def test_astronomy_show_list_read_serializer(self):
+        self.assertEqual(
+            AstronomyShowListReadSerializer(instance=self.astronomy_show).data,
+            AstronomyShowListSerializer(instance=self.astronomy_show).data,
+        )
+
+    def test_show_session_list_read_serializer(self):
+        show_session = ShowSession.objects.annotate(tickets_available=Value(149)).get(
+            id=self.show_session.id
+        )
+        self.assertEqual(
+            ShowSessionListReadSerializer(instance=show_session).data,
+            ShowSessionListSerializer(instance=show_session).data,
+        )
+
     def test_ticket_serializer(self):
         show_session = ShowSession.objects.create(
             show_time="2024-12-31 21:00",
@@ -126,6 +179,15 @@ class SerializerTests(TestCase):
         self.assertEqual(reservation.tickets.count(), 2)
         self.assertEqual(reservation.user, self.user)
 
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        # Reservations and their tickets, however many tickets there are.
+        with self.assertNumQueries(2):
+            res = client.get(reverse("planetarium:reservation-list"))
+
+        self.assertEqual(len(res.data["results"]), 2)
+
     def test_reservation_serializer_validation_error(self):
         data = {
             "tickets": [
@@ -139,3 +201,54 @@ class SerializerTests(TestCase):
         serializer = ReservationSerializer(data=data)
         with self.assertRaises(ValidationError):
             serializer.is_valid(raise_exception=True)
+
+    def test_reservation_serializer_duplicate_seat_validation_error(self):
+        data = {
+            "tickets": [
+                {"row": 5, "seat": 11, "show_session": self.show_session.id},
+                {"row": 5, "seat": 11, "show_session": self.show_session.id},
+            ]
+        }
+        serializer = ReservationSerializer(data=data)
+        with self.assertRaises(ValidationError):
+            serializer.is_valid(raise_exception=True)
+
+    def test_reservation_serializer_validates_tickets_in_bulk(self):
+        show_sessions = ShowSession.objects.bulk_create(
+            [
+                ShowSession(
+                    show_time=f"2025-01-0{day} 20:00Z",
+                    astronomy_show=self.astronomy_show,
+                    planetarium_dome=self.dome,
+                )
+                for day in range(1, 4)
+            ]
+        )
+        data = {
+            "tickets": [
+                {"row": row, "seat": 1, "show_session": show_session.id}
+                for show_session in show_sessions
+                for row in range(1, 4)
+            ]
+        }
+        serializer = ReservationSerializer(data=data)
+
+        # The show sessions with their domes, then the taken seats.
+        with self.assertNumQueries(2):
+            self.assertTrue(serializer.is_valid())
+
+    def test_reservation_serializer_taken_seat_validation_error(self):
+        data = {
+            "tickets": [
+                {"row": 5, "seat": 10, "show_session": self.show_session.id},
+            ]
+        }
+        serializer = ReservationSerializer(data=data)
+        with self.assertRaises(ValidationError):
+            serializer.is_valid(raise_exception=True)
+
+    def test_reservation_serializer_unknown_show_session_validation_error(self):
+        data = {"tickets": [{"row": 1, "seat": 1, "show_session": 0}]}
+        serializer = ReservationSerializer(data=data)
+        with self.assertRaises(ValidationError):
+            serializer.is_valid(raise_exception=True)
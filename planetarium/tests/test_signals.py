@@ -0,0 +1,128 @@
+from unittest import mock
+
+import redis
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase
+from django_redis import get_redis_connection
+
+from planetarium import signals
+from planetarium.models import ShowTheme, PlanetariumDome
+from planetarium.signals import get_versions, register_cache_key
+
+
+class InvalidateCacheTests(TestCase):
+    def tearDown(self):
+        get_redis_connection("default").flushdb(asynchronous=True)
+
+    def create_show_theme(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ShowTheme.objects.create(name="Galaxies")
+        signals._executor.submit(lambda: None).result()
+
+    def test_model_change_deletes_registered_keys(self):
+        cache.set("show_theme_view_page", "cached", 60)
+        register_cache_key(ShowTheme, cache.make_key("show_theme_view_page"), 60)
+
+        self.create_show_theme()
+
+        self.assertIsNone(cache.get("show_theme_view_page"))
+        self.assertFalse(get_redis_connection("default").exists("idx:show_theme_view"))
+
+    def test_model_change_keeps_keys_of_other_models(self):
+        cache.set("planetarium_dome_view_page", "cached", 60)
+        register_cache_key(
+            PlanetariumDome, cache.make_key("planetarium_dome_view_page"), 60
+        )
+
+        self.create_show_theme()
+
+        self.assertEqual(cache.get("planetarium_dome_view_page"), "cached")
+
+    def test_invalidation_waits_for_commit(self):
+        cache.set("show_theme_view_page", "cached", 60)
+        register_cache_key(ShowTheme, cache.make_key("show_theme_view_page"), 60)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            ShowTheme.objects.create(name="Galaxies")
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(cache.get("show_theme_view_page"), "cached")
+
+    def test_changes_in_one_transaction_are_invalidated_together(self):
+        cache.set("show_theme_view_page", "cached", 60)
+        cache.set("planetarium_dome_view_page", "cached", 60)
+        register_cache_key(ShowTheme, cache.make_key("show_theme_view_page"), 60)
+        register_cache_key(
+            PlanetariumDome, cache.make_key("planetarium_dome_view_page"), 60
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ShowTheme.objects.create(name="Galaxies")
+            PlanetariumDome.objects.create(name="Main", rows=10, seats_in_row=10)
+        signals._executor.submit(lambda: None).result()
+
+        self.assertIsNone(cache.get("show_theme_view_page"))
+        self.assertIsNone(cache.get("planetarium_dome_view_page"))
+
+    def test_rolled_back_changes_are_not_invalidated(self):
+        cache.set("show_theme_view_page", "cached", 60)
+        register_cache_key(ShowTheme, cache.make_key("show_theme_view_page"), 60)
+
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            ShowTheme.objects.create(name="Galaxies")
+            raise RuntimeError
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PlanetariumDome.objects.create(name="Main", rows=10, seats_in_row=10)
+        signals._executor.submit(lambda: None).result()
+
+        self.assertEqual(cache.get("show_theme_view_page"), "cached")
+
+    def test_large_index_is_deleted_in_chunks(self):
+        keys = [f"show_theme_view_page_{i}" for i in range(1200)]
+        cache.set_many({key: "cached" for key in keys}, 60)
+        for key in keys:
+            register_cache_key(ShowTheme, cache.make_key(key), 60)
+
+        self.create_show_theme()
+
+        self.assertEqual(cache.get_many(keys), {})
+
+    def test_unrelated_model_change_is_ignored(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            get_user_model().objects.create(email="test@user.com")
+
+        self.assertEqual(callbacks, [])
+
+    def test_model_change_bumps_version_once_before_and_after_commit(self):
+        (show_theme_version, dome_version) = get_versions([ShowTheme, PlanetariumDome])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ShowTheme.objects.create(name="Galaxies")
+            ShowTheme.objects.create(name="Nebulae")
+            self.assertEqual(
+                get_versions([ShowTheme, PlanetariumDome]),
+                [show_theme_version + 1, dome_version],
+            )
+
+        self.assertEqual(
+            get_versions([ShowTheme, PlanetariumDome]),
+            [show_theme_version + 2, dome_version],
+        )
+
+    def test_failed_invalidation_is_logged(self):
+        with mock.patch.object(
+            signals, "_invalidate", side_effect=redis.ConnectionError
+        ), self.assertLogs("planetarium.signals", level="ERROR"):
+            self.create_show_theme()
+
+    def test_failed_version_bump_is_logged(self):
+        with mock.patch.object(
+            signals._client, "pipeline", side_effect=redis.ConnectionError
+        ), self.assertLogs("planetarium.signals", level="ERROR") as logs:
+            self.create_show_theme()
+
+        self.assertIn("Cache version bump failed", logs.output[0])
+        self.assertTrue(ShowTheme.objects.filter(name="Galaxies").exists())
@@ -1,11 +1,13 @@
 import os
-import uuid
+import secrets
 
 from django.utils.text import slugify
 
 
 def image_file_path(instance, filename):
     _, extension = os.path.splitext(filename)
-    filename = f"{slugify(instance.title)}-{uuid.uuid4()}{extension}"
 
-    return os.path.join("uploads", "astronomy_show", filename)
+    return (
+        f"uploads/astronomy_show/"
+        f"{slugify(instance.title)}-{secrets.token_urlsafe(16)}{extension}"
+    )
@@ -1,71 +1,103 @@
-from datetime import datetime
+import logging
+from datetime import date, datetime, time, timedelta
 
-from django.db.models import F, Count
+from django.core.cache import cache
+from django.db.models import Exists, F, OuterRef, Prefetch
+from django.utils import timezone
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets, mixins, status, filters
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from planetarium.cache import CachedListMixin, conditional
+from planetarium.filters import FullTextSearchFilter
 from planetarium.models import (
     ShowSession,
     Reservation,
     AstronomyShow,
     PlanetariumDome,
     ShowTheme,
+    Ticket,
 )
 from planetarium.paginators import ReservationPagination
 from planetarium.permissions import IsAdminOrIfAuthenticatedReadOnly
+from planetarium.renderers import ORJSONRenderer
 from planetarium.serializers import (
     ShowThemeSerializer,
     PlanetariumDomeSerializer,
     AstronomyShowSerializer,
     AstronomyShowListSerializer,
+    AstronomyShowListReadSerializer,
     AstronomyShowDetailSerializer,
     AstronomyShowImageSerializer,
     ShowSessionSerializer,
     ShowSessionListSerializer,
+    ShowSessionListReadSerializer,
     ShowSessionDetailSerializer,
     ReservationSerializer,
     ReservationListSerializer,
 )
+from planetarium.signals import register_cache_key
 
+logger = logging.getLogger(__name__)
 
-class ShowThemeViewSet(viewsets.ModelViewSet):
+
+# Lists rows straight from .values(), skipping model instances.
+class ValuesListMixin:
+    list_values = ()
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).values(*self.list_values)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(list(page))
+
+        return Response(list(queryset))
+
+
+@method_decorator(conditional(ShowTheme), name="list")
+@method_decorator(conditional(ShowTheme), name="retrieve")
+class ShowThemeViewSet(CachedListMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = ShowTheme.objects.all()
+    cache_prefix = "show_theme_view"
+    cache_models = (ShowTheme,)
     serializer_class = ShowThemeSerializer
+    list_values = ("id", "name")
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     filter_backends = [filters.SearchFilter, DjangoFilterBackend]
     filterset_fields = ["name"]
     search_fields = ["name"]
 
-    @method_decorator(cache_page(60 * 5, key_prefix="show_theme_view"))
-    def dispatch(self, request, *args, **kwargs):
-        return super().dispatch(request, *args, **kwargs)
 
-
-class PlanetariumDomeViewSet(viewsets.ModelViewSet):
+@method_decorator(conditional(PlanetariumDome), name="list")
+@method_decorator(conditional(PlanetariumDome), name="retrieve")
+class PlanetariumDomeViewSet(CachedListMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = PlanetariumDome.objects.all()
+    cache_prefix = "planetarium_dome_view"
+    cache_models = (PlanetariumDome,)
     serializer_class = PlanetariumDomeSerializer
+    list_values = ("id", "name", "rows", "seats_in_row", "capacity")
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     filter_backends = [filters.SearchFilter, DjangoFilterBackend]
     filterset_fields = ["name"]
     search_fields = ["name"]
 
-    @method_decorator(cache_page(60 * 5, key_prefix="planetarium_dome_view"))
-    def dispatch(self, request, *args, **kwargs):
-        return super().dispatch(request, *args, **kwargs)
-
 
-class AstronomyShowViewSet(viewsets.ModelViewSet):
-    queryset = AstronomyShow.objects.prefetch_related("show_theme")
+@method_decorator(conditional(AstronomyShow, ShowTheme), name="list")
+@method_decorator(conditional(AstronomyShow, ShowTheme), name="retrieve")
+class AstronomyShowViewSet(CachedListMixin, viewsets.ModelViewSet):
+    queryset = AstronomyShow.objects.all()
+    cache_prefix = "astronomy_show_view"
+    cache_models = (AstronomyShow, ShowTheme)
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [FullTextSearchFilter]
     search_fields = ["title", "description"]
 
     @staticmethod
@@ -77,20 +109,30 @@ class AstronomyShowViewSet(viewsets.ModelViewSet):
         title = self.request.query_params.get("title")
         show_theme = self.request.query_params.get("show_theme")
 
-        queryset = self.queryset
+        queryset = AstronomyShow.objects.prefetch_related("show_theme")
+
+        if self.action == "list":
+            queryset = queryset.only("id", "title", "image")
 
         if title:
             queryset = queryset.filter(title__icontains=title)
 
         if show_theme:
             show_theme_ids = self._params_to_ints(show_theme)
-            queryset = queryset.filter(show_theme__id__in=show_theme_ids)
+            queryset = queryset.filter(
+                Exists(
+                    AstronomyShow.show_theme.through.objects.filter(
+                        astronomyshow_id=OuterRef("pk"),
+                        showtheme_id__in=show_theme_ids,
+                    )
+                )
+            )
 
-        return queryset.distinct()
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "list":
-            return AstronomyShowListSerializer
+            return AstronomyShowListReadSerializer
 
         if self.action == "retrieve":
             return AstronomyShowDetailSerializer
@@ -127,49 +169,70 @@ class AstronomyShowViewSet(viewsets.ModelViewSet):
                 type=OpenApiTypes.STR,
                 description="Filter by astronomy_show title (ex. ?title=something)",
             ),
-        ]
+        ],
+        responses=AstronomyShowListSerializer(many=True),
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @method_decorator(cache_page(60 * 5, key_prefix="astronomy_show_view"))
-    def dispatch(self, request, *args, **kwargs):
-        return super().dispatch(request, *args, **kwargs)
 
+# Tickets are bulk created with their reservation, which sends no Ticket
+# signals, so new reservations count as a change too.
+SHOW_SESSION_CACHE_MODELS = (
+    ShowSession,
+    AstronomyShow,
+    PlanetariumDome,
+    Ticket,
+    Reservation,
+)
 
-class ShowSessionViewSet(viewsets.ModelViewSet):
-    queryset = ShowSession.objects.select_related(
-        "astronomy_show", "planetarium_dome"
-    ).annotate(
-        tickets_available=(
-            F("planetarium_dome__rows") * F("planetarium_dome__seats_in_row")
-            - Count("tickets")
-        )
-    )
+
+@method_decorator(conditional(*SHOW_SESSION_CACHE_MODELS), name="list")
+@method_decorator(conditional(*SHOW_SESSION_CACHE_MODELS), name="retrieve")
+class ShowSessionViewSet(CachedListMixin, viewsets.ModelViewSet):
+    cache_prefix = "show_session_view"
+    cache_models = SHOW_SESSION_CACHE_MODELS
+    queryset = ShowSession.objects.all()
     serializer_class = ShowSessionSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
     def get_queryset(self):
-        date = self.request.query_params.get("date")
+        date_str = self.request.query_params.get("date")
         astronomy_show_id_str = self.request.query_params.get("astronomy_show")
 
-        queryset = self.queryset
+        queryset = ShowSession.objects.select_related(
+            "astronomy_show", "planetarium_dome"
+        ).annotate(
+            tickets_available=F("planetarium_dome__capacity") - F("tickets_sold")
+        )
 
-        if date:
+        if date_str:
             try:
-                date = datetime.strptime(date, "%Y-%m-%d").date()
-                queryset = queryset.filter(show_time__date=date)
+                day = date.fromisoformat(date_str)
             except ValueError:
-                print(f"Warning: Invalid date format: {date}")
+                logger.warning("Invalid date format: %s", date_str)
+            else:
+                day_start = datetime.combine(
+                    day, time.min, tzinfo=timezone.get_current_timezone()
+                )
+                queryset = queryset.filter(
+                    show_time__gte=day_start,
+                    show_time__lt=day_start + timedelta(days=1),
+                )
 
         if astronomy_show_id_str:
-            queryset = queryset.filter(movie_id=int(astronomy_show_id_str))
+            try:
+                astronomy_show_id = int(astronomy_show_id_str)
+            except ValueError:
+                logger.warning("Invalid astronomy_show id: %s", astronomy_show_id_str)
+            else:
+                queryset = queryset.filter(astronomy_show_id=astronomy_show_id)
 
         return queryset
 
     def get_serializer_class(self):
         if self.action == "list":
-            return ShowSessionListSerializer
+            return ShowSessionListReadSerializer
 
         if self.action == "retrieve":
             return ShowSessionDetailSerializer
@@ -190,31 +253,34 @@ class ShowSessionViewSet(viewsets.ModelViewSet):
                     "Filter by datetime of ShowSession " "(ex. ?date=2024-12-25)"
                 ),
             ),
-        ]
+        ],
+        responses=ShowSessionListSerializer(many=True),
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @method_decorator(cache_page(60 * 5, key_prefix="show_session_view"))
-    def dispatch(self, request, *args, **kwargs):
-        return super().dispatch(request, *args, **kwargs)
-
 
 class ReservationViewSet(
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     GenericViewSet,
 ):
-    queryset = Reservation.objects.prefetch_related(
-        "tickets__show_session__astronomy_show",
-        "tickets__show_session__planetarium_dome",
-    )
+    queryset = Reservation.objects.all()
     serializer_class = ReservationSerializer
     pagination_class = ReservationPagination
     permission_classes = (IsAuthenticated,)
+    renderer_classes = (ORJSONRenderer, BrowsableAPIRenderer)
+    cache_timeout = 60 * 5
 
     def get_queryset(self):
-        return Reservation.objects.filter(user=self.request.user)
+        return Reservation.objects.filter(user=self.request.user).prefetch_related(
+            Prefetch(
+                "tickets",
+                queryset=Ticket.objects.select_related(
+                    "show_session__astronomy_show", "show_session__planetarium_dome"
+                ).defer("show_session__astronomy_show__description"),
+            )
+        )
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -222,13 +288,20 @@ class ReservationViewSet(
 
         return ReservationSerializer
 
+    def list(self, request, *args, **kwargs):
+        cache_key = f"reservation_view_{request.user.id}"
+        pages = cache.get(cache_key, {})
+        path = request.get_full_path()
+
+        if path not in pages:
+            pages[path] = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, pages, self.cache_timeout)
+            register_cache_key(
+                Reservation, cache.make_key(cache_key), self.cache_timeout
+            )
+
+        return Response(pages[path])
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
-
-    @method_decorator(
-        cache_page(
-            60 * 5, key_prefix=lambda request: f"reservation_view_{request.user.id}"
-        )
-    )
-    def dispatch(self, request, *args, **kwargs):
-        return super().dispatch(request, *args, **kwargs)
+        cache.delete(f"reservation_view_{self.request.user.id}")